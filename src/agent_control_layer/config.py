@@ -1,9 +1,20 @@
 import warnings
+from functools import lru_cache
 from pathlib import Path
+from types import CodeType
 from typing import Any, Optional
 
 import yaml
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, ValidationError, field_validator
+
+# Prefer the libyaml C bindings when PyYAML was built with them.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=512)
+def _compile_condition(expression: str) -> CodeType:
+    """Compile a trigger condition, reusing the code object for repeated rules."""
+    return compile(expression, "<rule>", "eval")
 
 
 class Rule(BaseModel):
@@ -15,6 +26,16 @@ class Rule(BaseModel):
     instruction: str
     priority: int
 
+    @field_validator("trigger_condition")
+    @classmethod
+    def validate_trigger_condition(cls, value: str) -> str:
+        """Reject trigger conditions that do not compile as Python expressions."""
+        try:
+            _compile_condition(value)
+        except (SyntaxError, ValueError) as e:
+            raise ValueError(f"invalid trigger condition syntax: {e}") from e
+        return value
+
 
 class Contract(BaseModel):
     """Contract for a tool."""
@@ -27,14 +48,22 @@ class Contract(BaseModel):
 class Config:
     """Datagusto Agent Control Layer Config."""
 
-    def __init__(self):
-        """Initialize the config."""
+    def __init__(self, config_dir: Optional[Path] = None):
+        """Initialize the config.
+
+        Args:
+            config_dir: Directory containing the contract YAML files. Defaults to
+                ``.dg_acl`` under the current working directory.
+        """
+        self.config_dir = (
+            config_dir if config_dir is not None else Path.cwd() / ".dg_acl"
+        )
         self.contracts: dict[str, dict[str, Any]] = {}
         self._load_config()
 
     def _load_config(self):
         """Load the config."""
-        config_dir = Path.cwd() / ".dg_acl"
+        config_dir = self.config_dir
 
         if not config_dir.exists():
             warnings.warn(f"No config directory found at {config_dir}", stacklevel=2)
@@ -49,8 +78,8 @@ class Config:
         for yaml_file in yaml_files:
             try:
                 with open(yaml_file) as f:
-                    config_data = yaml.safe_load(f)
-                    contract = Contract(**config_data)
+                    config_data = yaml.load(f, Loader=_YamlLoader)
+                    contract = Contract.model_validate(config_data)
                     tool_name = contract.tool_name
 
                     # sort rules by priority
@@ -1,5 +1,6 @@
 import contextlib
 import json
+import re
 from typing import Annotated, Any, Optional
 
 from langchain_core.messages import ToolMessage
@@ -8,6 +9,32 @@ from langgraph.prebuilt import InjectedState
 from agent_control_layer.config import _config
 from agent_control_layer.layer import control_layer
 
+try:
+    import orjson  # type: ignore
+
+    _orjson_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson comes with langgraph-sdk
+    _orjson_loads = None
+
+# Any JSON document starts (after optional whitespace) with one of these, so other
+# strings can skip the parse attempt. N and I cover json's NaN/Infinity literals.
+_JSON_START = re.compile(r'\s*[{\["\-0-9tfnNI]')
+
+# orjson decodes integers outside the 64-bit range as floats, where json keeps the
+# exact int; any such integer has at least 19 digits.
+_LONG_DIGIT_RUN = re.compile(r"\d{19}")
+
+
+def _json_loads(content: str) -> Any:
+    """Decode JSON with orjson, giving the same result as json.loads."""
+    if _orjson_loads is not None and not _LONG_DIGIT_RUN.search(content):
+        try:
+            return _orjson_loads(content)
+        except ValueError:
+            # json also accepts NaN, out-of-range floats and lone surrogates
+            pass
+    return json.loads(content)
+
 
 def _find_latest_tool_message(messages: list) -> Optional[ToolMessage]:
     """Find the latest tool message in the messages list."""
@@ -17,6 +44,15 @@ def _find_latest_tool_message(messages: list) -> Optional[ToolMessage]:
     return None
 
 
+def _parse_tool_output(content: Any) -> Any:
+    """Parse a JSON tool output, returning the content unchanged otherwise."""
+    if not isinstance(content, str) or not _JSON_START.match(content):
+        return content
+    with contextlib.suppress(Exception):
+        return _json_loads(content)
+    return content
+
+
 def build_control_layer_tools(state_class):
     """Build the tools for the control layer."""
 
@@ -95,10 +131,7 @@ def build_control_layer_tools(state_class):
             latest_tool_message, ToolMessage
         ):
             tool_name = latest_tool_message.name
-            tool_output = latest_tool_message.content
-
-            with contextlib.suppress(Exception):
-                tool_output = json.loads(tool_output)  # type: ignore
+            tool_output = _parse_tool_output(latest_tool_message.content)
 
             control_layer_result = control_layer(tool_name, tool_output)  # type: ignore
 
@@ -1,7 +1,8 @@
 import warnings
-from typing import Any, Union
+from functools import lru_cache
+from typing import Any, Optional, Union
 
-from agent_control_layer.config import _config
+from agent_control_layer.config import _compile_condition, _config
 
 SAFE_GLOBALS = {
     "len": len,
@@ -20,44 +21,93 @@ SAFE_GLOBALS = {
 }
 
 
+# (trigger condition, error type) pairs that have already been warned about.
+_warned_rule_errors: set[tuple[str, str]] = set()
+
+
+def _warn_rule_error_once(expression: Any, error_type: str, message: str) -> None:
+    """Warn about a failing trigger condition once per condition and error type."""
+    condition = expression if isinstance(expression, str) else repr(expression)
+    key = (condition, error_type)
+    if key in _warned_rule_errors:
+        return
+    _warned_rule_errors.add(key)
+    warnings.warn(message, stacklevel=4)
+
+
 def _is_rule_triggered(
     rule: dict[str, Any], tool_output: Union[dict, list, str]
 ) -> bool:
     """Check if the rule is triggered."""
-    expression = rule.get("trigger_condition")
+    return _evaluate_condition(rule.get("trigger_condition"), tool_output)
 
+
+def _evaluate_condition(expression: Any, tool_output: Union[dict, list, str]) -> bool:
+    """Evaluate a trigger condition against the tool output."""
     safe_locals = {"tool_output": tool_output}
 
     if not isinstance(expression, str) or not expression.strip():
-        warnings.warn(
+        _warn_rule_error_once(
+            expression,
+            "InvalidType",
             (
                 "Error evaluating expression: trigger_condition must be a non-empty "
                 f"string, but got {type(expression)}"
             ),
-            stacklevel=2,
         )
         return False
 
     restricted_globals = {"__builtins__": {}, **SAFE_GLOBALS}
 
     try:
-        return eval(expression, restricted_globals, safe_locals)
+        return eval(_compile_condition(expression), restricted_globals, safe_locals)
     except Exception as e:
-        warnings.warn(f"Error evaluating expression: {e}", stacklevel=2)
+        _warn_rule_error_once(
+            expression, type(e).__name__, f"Error evaluating expression: {e}"
+        )
         return False
 
 
+def _first_triggered_index(
+    conditions: tuple[Any, ...], tool_output: Union[dict, list, str]
+) -> Optional[int]:
+    """Return the index of the first triggered condition, if any."""
+    for index, condition in enumerate(conditions):
+        if _evaluate_condition(condition, tool_output):
+            return index
+    return None
+
+
+# Conditions only see tool_output and SAFE_GLOBALS, so the first triggered index
+# is a pure function of its arguments and can be reused for repeated outputs.
+_cached_first_triggered_index = lru_cache(maxsize=256)(_first_triggered_index)
+
+# Longer outputs are not cached, so the cache never keeps large payloads alive.
+_MAX_CACHED_OUTPUT_LENGTH = 4096
+
+
 def _evaluate_contract(
     contract: dict[str, Any], tool_output: Union[dict, list, str]
 ) -> dict[str, Any]:
     """Evaluate the contract for a tool."""
-    instruction = None
-    for rule in contract.get("rules", []):
-        if _is_rule_triggered(rule, tool_output):
-            instruction = rule.get("instruction")
-            return {"instruction": instruction, "rule": rule}
+    rules = contract.get("rules", [])
+    conditions = tuple(rule.get("trigger_condition") for rule in rules)
+
+    # Only short str outputs and str conditions are used as cache keys.
+    if (
+        isinstance(tool_output, str)
+        and len(tool_output) <= _MAX_CACHED_OUTPUT_LENGTH
+        and all(isinstance(condition, str) for condition in conditions)
+    ):
+        index = _cached_first_triggered_index(conditions, tool_output)
+    else:
+        index = _first_triggered_index(conditions, tool_output)
+
+    if index is None:
+        return {"instruction": None, "rule": None}
 
-    return {"instruction": None, "rule": None}
+    rule = rules[index]
+    return {"instruction": rule.get("instruction"), "rule": rule}
 
 
 def control_layer(
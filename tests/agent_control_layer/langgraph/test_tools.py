@@ -1,12 +1,15 @@
 """Tests for langgraph tools module."""
 
 import json
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
+import pytest
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
 from agent_control_layer.langgraph.tools import (
     _find_latest_tool_message,
+    _parse_tool_output,
     build_control_layer_tools,
 )
 
@@ -77,15 +80,140 @@ class TestFindLatestToolMessage:
         assert result.content == "third"
         assert result.name == "tool3"
 
+    def test_find_latest_tool_message_stops_at_latest_match(self):
+        """Test that the scan stops at the latest ToolMessage from the tail."""
+
+        class RecordingMessages:
+            def __init__(self, items):
+                self.items = items
+                self.accessed = []
+
+            def __len__(self):
+                return len(self.items)
+
+            def __getitem__(self, index):
+                self.accessed.append(index)
+                return self.items[index]
+
+        messages = RecordingMessages(
+            [HumanMessage(content="hi", id=str(i)) for i in range(100)]
+            + [
+                ToolMessage(content="latest", name="tool1", tool_call_id="t1"),
+                AIMessage(content="hello", id="ai"),
+            ]
+        )
+
+        result = _find_latest_tool_message(messages)  # type: ignore
+
+        assert result.content == "latest"
+        assert messages.accessed == [101, 100]
+
+    def test_find_latest_tool_message_after_append(self):
+        """Test that appending to the list is reflected in the next lookup."""
+        messages = [ToolMessage(content="first", name="tool1", tool_call_id="t1")]
+        assert _find_latest_tool_message(messages).content == "first"
+
+        messages.append(ToolMessage(content="second", name="tool2", tool_call_id="t2"))
+        assert _find_latest_tool_message(messages).content == "second"
+
+        messages[-1] = HumanMessage(content="replaced", id="1")
+        assert _find_latest_tool_message(messages).content == "first"
+
+    def test_find_latest_tool_message_with_reused_list_id(self):
+        """Test that a new list reusing a freed list's id is scanned afresh."""
+        ai_message = AIMessage(content="hello", id="ai")
+        first = ToolMessage(content="first", name="search", tool_call_id="t1")
+        second = ToolMessage(content="second", name="delete_db", tool_call_id="t2")
+        messages = [first, ai_message]
+        assert _find_latest_tool_message(messages).name == "search"
+        old_id = id(messages)
+
+        del messages
+        messages = [second, ai_message]
+
+        if id(messages) != old_id:
+            pytest.skip("the interpreter did not reuse the list id")
+        assert _find_latest_tool_message(messages).name == "delete_db"
+
+
+class TestParseToolOutput:
+    """Test the _parse_tool_output function."""
+
+    def test_parse_json_object_and_array(self):
+        """Test that JSON objects and arrays are decoded."""
+        assert _parse_tool_output('{"key": "value"}') == {"key": "value"}
+        assert _parse_tool_output("[1, 2, 3]") == [1, 2, 3]
+
+    def test_parse_json_with_leading_whitespace(self):
+        """Test that leading whitespace does not prevent decoding."""
+        assert _parse_tool_output('\n  {"key": "value"}') == {"key": "value"}
+
+    def test_parse_json_scalars(self):
+        """Test that JSON scalars are decoded as before."""
+        assert _parse_tool_output("42") == 42
+        assert _parse_tool_output("-1.5") == -1.5
+        assert _parse_tool_output("true") is True
+        assert _parse_tool_output("null") is None
+        assert _parse_tool_output('"quoted"') == "quoted"
+
+    def test_parse_matches_json_for_orjson_edge_cases(self):
+        """Test that results match json.loads where orjson would differ."""
+        for content in [
+            "12345678901234567890123",
+            "-9223372036854775809",
+            '{"id": 18446744073709551616}',
+            "NaN",
+            "1e400",
+            '"\\ud800"',
+        ]:
+            expected = json.loads(content)
+            result = _parse_tool_output(content)
+            assert type(result) is type(expected), content
+            if expected == expected:  # NaN != NaN
+                assert result == expected, content
+
+    def test_orjson_skipped_for_long_digit_runs(self):
+        """Test that only outputs without long digit runs go through orjson."""
+        with patch(
+            "agent_control_layer.langgraph.tools._orjson_loads", wraps=json.loads
+        ) as mock_orjson_loads:
+            assert _parse_tool_output('{"id": 1}') == {"id": 1}
+            assert _parse_tool_output('{"id": 12345678901234567890}') == {
+                "id": 12345678901234567890
+            }
+
+        mock_orjson_loads.assert_called_once_with('{"id": 1}')
+
+    def test_plain_text_skips_parse(self):
+        """Test that text which cannot be JSON is returned without parsing."""
+        with patch("agent_control_layer.langgraph.tools._json_loads") as mock_loads:
+            assert _parse_tool_output("plain output") == "plain output"
+            assert _parse_tool_output("") == ""
+
+        mock_loads.assert_not_called()
+
+    def test_invalid_json_returned_unchanged(self):
+        """Test that text which looks like JSON but is invalid is returned as is."""
+        assert _parse_tool_output("{key: 'value'}") == "{key: 'value'}"
+        assert _parse_tool_output("not json") == "not json"
+
+    def test_non_str_content_returned_unchanged(self):
+        """Test that non-str content is passed through untouched."""
+        content = [{"type": "text", "text": "hi"}]
+        assert _parse_tool_output(content) is content
+
 
 class TestBuildControlLayerTools:
     """Test the build_control_layer_tools function."""
 
+    @classmethod
+    def setup_class(cls):
+        """Build the tools once; patches act on module attributes at call time."""
+        cls.tools = build_control_layer_tools(SimpleNamespace)
+
     def test_build_control_layer_tools_returns_functions(self):
         """Test that build_control_layer_tools returns a list of functions."""
-        MockStateClass = MagicMock()
-
-        tools = build_control_layer_tools(MagicMock())
+        tools = self.tools
 
         assert isinstance(tools, list)
         assert len(tools) == 2
@@ -96,9 +224,9 @@ class TestBuildControlLayerTools:
     def test_control_layer_init_function(self, mock_config):
         """Test the control_layer_init function."""
         mock_config.contracts.keys.return_value = ["tool1", "tool2"]
-        mock_state = MagicMock()
+        mock_state = SimpleNamespace()
 
-        tools = build_control_layer_tools(MagicMock())
+        tools = self.tools
         control_layer_init = tools[0]
 
         result = control_layer_init(mock_state)
@@ -111,10 +239,9 @@ class TestBuildControlLayerTools:
 
     def test_control_layer_post_hook_no_tool_message(self):
         """Test control_layer_post_hook when no ToolMessage is found."""
-        mock_state = MagicMock()
-        mock_state.messages = [HumanMessage(content="hi", id="1")]
+        mock_state = SimpleNamespace(messages=[HumanMessage(content="hi", id="1")])
 
-        tools = build_control_layer_tools(MagicMock())
+        tools = self.tools
         control_layer_post_hook = tools[1]
 
         result = control_layer_post_hook(mock_state)
@@ -133,13 +260,13 @@ class TestBuildControlLayerTools:
             "rule": mock_rule,
         }
 
-        mock_state = MagicMock()
+        mock_state = SimpleNamespace()
         tool_message = ToolMessage(
             content="output", name="test_tool", tool_call_id="t1"
         )
         mock_state.messages = [tool_message]
 
-        tools = build_control_layer_tools(MagicMock())
+        tools = self.tools
         control_layer_post_hook = tools[1]
 
         result = control_layer_post_hook(mock_state)
@@ -162,13 +289,13 @@ class TestBuildControlLayerTools:
         }
         json_output = json.dumps({"key": "value"})
 
-        mock_state = MagicMock()
+        mock_state = SimpleNamespace()
         tool_message = ToolMessage(
             content=json_output, name="json_tool", tool_call_id="t1"
         )
         mock_state.messages = [tool_message]
 
-        tools = build_control_layer_tools(MagicMock())
+        tools = self.tools
         control_layer_post_hook = tools[1]
 
         result = control_layer_post_hook(mock_state)
@@ -191,13 +318,13 @@ class TestBuildControlLayerTools:
         }
         invalid_json_output = "{key: 'value'}"  # Invalid JSON
 
-        mock_state = MagicMock()
+        mock_state = SimpleNamespace()
         tool_message = ToolMessage(
             content=invalid_json_output, name="invalid_json_tool", tool_call_id="t1"
         )
         mock_state.messages = [tool_message]
 
-        tools = build_control_layer_tools(MagicMock())
+        tools = self.tools
         control_layer_post_hook = tools[1]
 
         result = control_layer_post_hook(mock_state)
@@ -220,7 +347,7 @@ class TestBuildControlLayerTools:
             "instruction": "mixed_instruction",
             "rule": mock_rule,
         }
-        mock_state = MagicMock()
+        mock_state = SimpleNamespace()
 
         # Create mixed messages with ToolMessage being the latest
         messages = [
@@ -232,7 +359,7 @@ class TestBuildControlLayerTools:
         ]
         mock_state.messages = messages
 
-        tools = build_control_layer_tools(MagicMock())
+        tools = self.tools
         control_layer_post_hook = tools[1]
 
         result = control_layer_post_hook(mock_state)
@@ -245,8 +372,7 @@ class TestBuildControlLayerTools:
 
     def test_function_docstrings_exist(self):
         """Test that functions have proper docstrings."""
-        MockStateClass = MagicMock()
-        tools = build_control_layer_tools(MagicMock())
+        tools = self.tools
 
         control_layer_init = tools[0]
         control_layer_post_hook = tools[1]
@@ -1,208 +1,230 @@
-import os
-import shutil
-import unittest
+"""Tests for config module."""
+
 from pathlib import Path
 
-import yaml
+import pytest
 
 from agent_control_layer.config import Config
 
+SEARCH_UNSORTED_YAML = """\
+tool_name: search
+description: Rules for the search tool
+rules:
+- name: rule_priority_2
+  description: Rule with priority 2
+  trigger_condition: condition2
+  instruction: instruction2
+  priority: 2
+- name: rule_priority_1
+  description: Rule with priority 1
+  trigger_condition: condition1
+  instruction: instruction1
+  priority: 1
+"""
+
+# Config data missing 'priority' in a rule
+SEARCH_MISSING_PRIORITY_YAML = """\
+tool_name: search
+description: Rules for the search tool
+rules:
+- name: invalid_rule
+  description: This rule is missing priority.
+  trigger_condition: condition
+  instruction: instruction
+"""
+
+SEARCH_INVALID_CONDITION_YAML = """\
+tool_name: search
+description: Rules for the search tool
+rules:
+- name: invalid_condition
+  description: This rule has a syntax error in its trigger condition.
+  trigger_condition: len(tool_output) <
+  instruction: instruction
+  priority: 1
+"""
+
+# Parses as an expression but is rejected by compile()
+SEARCH_YIELD_CONDITION_YAML = SEARCH_INVALID_CONDITION_YAML.replace(
+    "len(tool_output) <", '"(yield)"'
+)
+
+SINGLE_RULE_YAML = """\
+tool_name: {tool_name}
+description: {description}
+rules:
+- name: {rule_name}
+  description: d
+  trigger_condition: c
+  instruction: i
+  priority: 1
+"""
+
+SEARCH_YAML = SINGLE_RULE_YAML.format(
+    tool_name="search", description="Rules for the search tool", rule_name="r"
+)
+TOOL1_YAML = SINGLE_RULE_YAML.format(
+    tool_name="tool1", description="Rules for tool1", rule_name="r1"
+)
+TOOL2_YAML = SINGLE_RULE_YAML.format(
+    tool_name="tool2", description="Rules for tool2", rule_name="r2"
+)
+VALID_TOOL_YAML = SINGLE_RULE_YAML.format(
+    tool_name="valid_tool", description="A valid tool config", rule_name="r"
+)
+
+# Invalid because 'rules' is missing
+INVALID_TOOL_YAML = """\
+tool_name: invalid_tool
+description: d
+"""
+
+NON_MAPPING_YAML = "- tool_name: search\n"
+
+MALFORMED_YAML = "tool_name: search\n- description: invalid syntax"
+
+UNSAFE_TAG_YAML = "tool_name: !!python/object/apply:os.getcwd []\n"
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    """Create an empty ``.dg_acl`` directory for the test."""
+    config_dir = tmp_path / ".dg_acl"
+    config_dir.mkdir()
+    return config_dir
+
+
+def _write_config(config_dir: Path, filename: str, content: str):
+    """Helper function to write a config file."""
+    (config_dir / filename).write_text(content)
+
+
+class TestConfig:
+    """Test the Config class."""
+
+    def test_load_config_with_valid_yaml_and_rule_sorting(self, config_dir):
+        """Tests loading a valid config and ensures rules are sorted by priority."""
+        _write_config(config_dir, "config.yaml", SEARCH_UNSORTED_YAML)
 
-class TestConfig(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory for testing
-        self.test_dir = Path("test_config_temp_dir")
-        self.test_dir.mkdir(exist_ok=True)
+        config = Config(config_dir)
+        assert "search" in config.contracts
+        search_contract = config.get("search")
+        assert search_contract is not None
 
-        # Store the original working directory
-        self.original_cwd = Path.cwd()
-        os.chdir(self.test_dir)
+        rules = search_contract.get("rules", [])
+        assert len(rules) == 2
+        assert rules[0]["priority"] == 1
+        assert rules[0]["name"] == "rule_priority_1"
+        assert rules[1]["priority"] == 2
+        assert rules[1]["name"] == "rule_priority_2"
 
-        # Create the config directory
-        self.config_dir = Path(".dg_acl")
-        self.config_dir.mkdir()
+    def test_load_config_with_validation_error(self, config_dir):
+        """Tests that a file with a validation error (e.g., missing field) raises a warning."""
+        _write_config(config_dir, "invalid_config.yaml", SEARCH_MISSING_PRIORITY_YAML)
 
-    def tearDown(self):
-        # Return to the original working directory
-        os.chdir(self.original_cwd)
-        # Clean up the temporary directory
-        shutil.rmtree(self.test_dir)
+        with pytest.warns(UserWarning, match="Invalid config file"):
+            config = Config(config_dir)
 
-    def _write_config(self, filename: str, data: dict):
-        """Helper function to write a config file."""
-        with open(self.config_dir / filename, "w") as f:
-            yaml.dump(data, f)
+        # The invalid config should not be loaded
+        assert len(config.contracts) == 0
 
-    def test_load_config_with_valid_yaml_and_rule_sorting(self):
-        """Tests loading a valid config and ensures rules are sorted by priority."""
-        config_data = {
-            "tool_name": "search",
-            "description": "Rules for the search tool",
-            "rules": [
-                {
-                    "name": "rule_priority_2",
-                    "description": "Rule with priority 2",
-                    "trigger_condition": "condition2",
-                    "instruction": "instruction2",
-                    "priority": 2,
-                },
-                {
-                    "name": "rule_priority_1",
-                    "description": "Rule with priority 1",
-                    "trigger_condition": "condition1",
-                    "instruction": "instruction1",
-                    "priority": 1,
-                },
-            ],
-        }
-        self._write_config("config.yaml", config_data)
+    def test_load_config_with_invalid_trigger_condition(self, config_dir):
+        """Tests that a rule whose trigger condition does not parse is rejected."""
+        _write_config(config_dir, "invalid_config.yaml", SEARCH_INVALID_CONDITION_YAML)
 
-        config = Config()
-        self.assertIn("search", config.contracts)
-        search_contract = config.get("search")
-        self.assertIsNotNone(search_contract)
+        with pytest.warns(UserWarning, match="Invalid config file"):
+            config = Config(config_dir)
 
-        rules = search_contract.get("rules", [])
-        self.assertEqual(len(rules), 2)
-        self.assertEqual(rules[0]["priority"], 1)
-        self.assertEqual(rules[0]["name"], "rule_priority_1")
-        self.assertEqual(rules[1]["priority"], 2)
-        self.assertEqual(rules[1]["name"], "rule_priority_2")
+        assert len(config.contracts) == 0
 
-    def test_load_config_with_validation_error(self):
-        """Tests that a file with a validation error (e.g., missing field) raises a warning."""
-        # Config data missing 'priority' in a rule
-        invalid_config_data = {
-            "tool_name": "search",
-            "description": "Rules for the search tool",
-            "rules": [
-                {
-                    "name": "invalid_rule",
-                    "description": "This rule is missing priority.",
-                    "trigger_condition": "condition",
-                    "instruction": "instruction",
-                }
-            ],
-        }
-        self._write_config("invalid_config.yaml", invalid_config_data)
-
-        with self.assertWarnsRegex(UserWarning, "Invalid config file"):
-            config = Config()
+    def test_load_config_with_uncompilable_trigger_condition(self, config_dir):
+        """Tests that a condition which parses but does not compile is rejected."""
+        _write_config(config_dir, "invalid_config.yaml", SEARCH_YIELD_CONDITION_YAML)
 
-        # The invalid config should not be loaded
-        self.assertEqual(len(config.contracts), 0)
+        with pytest.warns(UserWarning, match="Invalid config file"):
+            config = Config(config_dir)
+
+        assert len(config.contracts) == 0
 
-    def test_load_config_with_no_config_dir(self):
+    @pytest.mark.parametrize(
+        "content", ["", NON_MAPPING_YAML], ids=["empty", "sequence"]
+    )
+    def test_load_config_with_non_mapping_document(self, config_dir, content):
+        """Tests that an empty or non-mapping document is reported as invalid."""
+        _write_config(config_dir, "config.yaml", content)
+
+        with pytest.warns(UserWarning, match="Invalid config file"):
+            config = Config(config_dir)
+
+        assert len(config.contracts) == 0
+
+    def test_load_config_with_no_config_dir(self, tmp_path):
         """Tests that a warning is raised when the .dg_acl directory does not exist."""
-        shutil.rmtree(self.config_dir)
-        with self.assertWarnsRegex(UserWarning, "No config directory found"):
-            Config()
+        with pytest.warns(UserWarning, match="No config directory found"):
+            Config(tmp_path / ".dg_acl")
 
-    def test_load_config_with_no_yaml_files(self):
+    def test_load_config_with_no_yaml_files(self, config_dir):
         """Tests that a warning is raised when the config directory is empty."""
-        with self.assertWarnsRegex(UserWarning, "No config files found"):
-            Config()
+        with pytest.warns(UserWarning, match="No config files found"):
+            Config(config_dir)
 
-    def test_get_config(self):
-        """Tests the get() method for retrieving tool configurations."""
-        config_data = {
-            "tool_name": "search",
-            "description": "Rules for the search tool",
-            "rules": [
-                {
-                    "name": "r",
-                    "description": "d",
-                    "trigger_condition": "c",
-                    "instruction": "i",
-                    "priority": 1,
-                }
-            ],
-        }
-        self._write_config("config.yaml", config_data)
+    def test_load_config_defaults_to_cwd(self, config_dir, monkeypatch):
+        """Tests that the .dg_acl directory under the cwd is used by default."""
+        _write_config(config_dir, "config.yaml", SEARCH_YAML)
+        monkeypatch.chdir(config_dir.parent)
 
         config = Config()
+        assert config.config_dir == Path.cwd() / ".dg_acl"
+        assert "search" in config.contracts
+
+    def test_get_config(self, config_dir):
+        """Tests the get() method for retrieving tool configurations."""
+        _write_config(config_dir, "config.yaml", SEARCH_YAML)
+
+        config = Config(config_dir)
         search_config = config.get("search")
-        self.assertIsNotNone(search_config)
-        self.assertEqual(search_config["tool_name"], "search")
+        assert search_config is not None
+        assert search_config["tool_name"] == "search"
 
         none_config = config.get("non_existent_tool")
-        self.assertIsNone(none_config)
+        assert none_config is None
 
-    def test_load_multiple_and_mixed_extension_files(self):
+    def test_load_multiple_and_mixed_extension_files(self, config_dir):
         """Tests loading multiple config files with .yaml and .yml extensions."""
-        config_data_1 = {
-            "tool_name": "tool1",
-            "description": "Rules for tool1",
-            "rules": [
-                {
-                    "name": "r1",
-                    "description": "d",
-                    "trigger_condition": "c",
-                    "instruction": "i",
-                    "priority": 1,
-                }
-            ],
-        }
-        config_data_2 = {
-            "tool_name": "tool2",
-            "description": "Rules for tool2",
-            "rules": [
-                {
-                    "name": "r2",
-                    "description": "d",
-                    "trigger_condition": "c",
-                    "instruction": "i",
-                    "priority": 1,
-                }
-            ],
-        }
-        self._write_config("tool1.yaml", config_data_1)
-        self._write_config("tool2.yml", config_data_2)
+        _write_config(config_dir, "tool1.yaml", TOOL1_YAML)
+        _write_config(config_dir, "tool2.yml", TOOL2_YAML)
 
-        config = Config()
-        self.assertEqual(len(config.contracts), 2)
-        self.assertIn("tool1", config.contracts)
-        self.assertIn("tool2", config.contracts)
+        config = Config(config_dir)
+        assert len(config.contracts) == 2
+        assert "tool1" in config.contracts
+        assert "tool2" in config.contracts
 
-    def test_load_with_one_invalid_file_among_valid_ones(self):
+    def test_load_with_one_invalid_file_among_valid_ones(self, config_dir):
         """Tests that valid configs are loaded even if one file is invalid."""
-        valid_config = {
-            "tool_name": "valid_tool",
-            "description": "A valid tool config",
-            "rules": [
-                {
-                    "name": "r",
-                    "description": "d",
-                    "trigger_condition": "c",
-                    "instruction": "i",
-                    "priority": 1,
-                }
-            ],
-        }
-        # Invalid because 'rules' is missing
-        invalid_config = {"tool_name": "invalid_tool", "description": "d"}
-
-        self._write_config("valid.yaml", valid_config)
-        self._write_config("invalid.yml", invalid_config)
-
-        with self.assertWarns(UserWarning):
-            config = Config()
-
-        self.assertEqual(len(config.contracts), 1)
-        self.assertIn("valid_tool", config.contracts)
-        self.assertNotIn("invalid_tool", config.contracts)
-
-    def test_load_config_with_malformed_yaml_syntax(self):
+        _write_config(config_dir, "valid.yaml", VALID_TOOL_YAML)
+        _write_config(config_dir, "invalid.yml", INVALID_TOOL_YAML)
+
+        with pytest.warns(UserWarning):
+            config = Config(config_dir)
+
+        assert len(config.contracts) == 1
+        assert "valid_tool" in config.contracts
+        assert "invalid_tool" not in config.contracts
+
+    def test_load_config_with_malformed_yaml_syntax(self, config_dir):
         """Tests that a file with invalid YAML syntax raises a warning."""
-        malformed_yaml = "tool_name: search\n- description: invalid syntax"
-        with open(self.config_dir / "malformed.yaml", "w") as f:
-            f.write(malformed_yaml)
+        _write_config(config_dir, "malformed.yaml", MALFORMED_YAML)
+
+        with pytest.warns(UserWarning, match="Error loading config file"):
+            config = Config(config_dir)
 
-        with self.assertWarnsRegex(UserWarning, "Error loading config file"):
-            config = Config()
+        assert len(config.contracts) == 0
 
-        self.assertEqual(len(config.contracts), 0)
+    def test_load_config_rejects_unsafe_yaml_tags(self, config_dir):
+        """Tests that python-specific YAML tags are not constructed."""
+        _write_config(config_dir, "unsafe.yaml", UNSAFE_TAG_YAML)
 
+        with pytest.warns(UserWarning, match="Error loading config file"):
+            config = Config(config_dir)
 
-if __name__ == "__main__":
-    unittest.main()
+        assert len(config.contracts) == 0
@@ -1,17 +1,30 @@
 """Tests for layer module."""
 
+import warnings
 from unittest.mock import patch
 
 import pytest
 
 from agent_control_layer.layer import (
+    _MAX_CACHED_OUTPUT_LENGTH,
     SAFE_GLOBALS,
+    _cached_first_triggered_index,
+    _compile_condition,
     _evaluate_contract,
     _is_rule_triggered,
+    _warned_rule_errors,
     control_layer,
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_warned_rule_errors():
+    """Forget previously warned rule errors so each test sees its own warning."""
+    _warned_rule_errors.clear()
+    yield
+    _warned_rule_errors.clear()
+
+
 class TestIsRuleTriggered:
     """Test the _is_rule_triggered function."""
 
@@ -102,6 +115,40 @@ class TestIsRuleTriggered:
             result = _is_rule_triggered(rule, tool_output)
             assert result is False
 
+    def test_repeated_error_warns_once(self):
+        """Test that the same failing condition only warns on its first failure."""
+        rule = {"trigger_condition": "undefined_var > 0"}
+
+        with pytest.warns(UserWarning, match="Error evaluating expression"):
+            assert _is_rule_triggered(rule, "test") is False
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert _is_rule_triggered(rule, "test") is False
+            assert _is_rule_triggered(dict(rule), "other") is False
+
+    def test_different_error_type_warns_again(self):
+        """Test that a new kind of error on the same condition is still reported."""
+        rule = {"trigger_condition": "tool_output[0] > 0"}
+
+        with pytest.warns(UserWarning, match="not subscriptable"):
+            assert _is_rule_triggered(rule, None) is False  # type: ignore
+
+        with pytest.warns(UserWarning, match="out of range"):
+            assert _is_rule_triggered(rule, []) is False
+
+    def test_compiled_condition_is_reused(self):
+        """Test that a repeated trigger condition is compiled only once."""
+        rule = {"trigger_condition": "len(tool_output) == 11"}
+        _is_rule_triggered(rule, "test")
+        hits_before = _compile_condition.cache_info().hits
+
+        assert _is_rule_triggered(rule, "test_output") is True
+        assert _compile_condition.cache_info().hits == hits_before + 1
+        assert _compile_condition(rule["trigger_condition"]) is _compile_condition(
+            rule["trigger_condition"]
+        )
+
 
 class TestEvaluateContract:
     """Test the _evaluate_contract function."""
@@ -226,6 +273,83 @@ class TestEvaluateContract:
         expected_rule = {"trigger_condition": "len(tool_output) > 0"}
         assert result == {"instruction": None, "rule": expected_rule}
 
+    def test_repeated_str_output_is_cached(self):
+        """Test that re-evaluating the same str output reuses the cached result."""
+        contract = {
+            "tool_name": "test_tool",
+            "rules": [
+                {"trigger_condition": "'retry' in tool_output", "instruction": "a"},
+                {"trigger_condition": "len(tool_output) > 0", "instruction": "b"},
+            ],
+        }
+        tool_output = "cached retry output"
+
+        first = _evaluate_contract(contract, tool_output)
+        hits_before = _cached_first_triggered_index.cache_info().hits
+        second = _evaluate_contract(contract, tool_output)
+
+        assert _cached_first_triggered_index.cache_info().hits == hits_before + 1
+        assert first == second == {"instruction": "a", "rule": contract["rules"][0]}
+
+    def test_long_str_output_is_not_cached(self):
+        """Test that outputs above the length cap are evaluated uncached."""
+        contract = {
+            "tool_name": "test_tool",
+            "rules": [
+                {"trigger_condition": "len(tool_output) > 0", "instruction": "a"}
+            ],
+        }
+        tool_output = "x" * (_MAX_CACHED_OUTPUT_LENGTH + 1)
+        cache_info_before = _cached_first_triggered_index.cache_info()
+
+        result = _evaluate_contract(contract, tool_output)
+
+        assert result == {"instruction": "a", "rule": contract["rules"][0]}
+        assert _cached_first_triggered_index.cache_info() == cache_info_before
+
+    def test_unhashable_output_is_not_cached(self):
+        """Test that dict outputs are evaluated without going through the cache."""
+        contract = {
+            "tool_name": "test_tool",
+            "rules": [
+                {"trigger_condition": "len(tool_output) > 1", "instruction": "big"},
+                {"trigger_condition": "len(tool_output) > 0", "instruction": "small"},
+            ],
+        }
+        tool_output = {"key": "value"}
+        misses_before = _cached_first_triggered_index.cache_info().misses
+
+        result = _evaluate_contract(contract, tool_output)
+        assert result == {"instruction": "small", "rule": contract["rules"][1]}
+
+        tool_output["other"] = "value"
+        result = _evaluate_contract(contract, tool_output)
+        assert result == {"instruction": "big", "rule": contract["rules"][0]}
+        assert _cached_first_triggered_index.cache_info().misses == misses_before
+
+    def test_rules_edited_after_loading(self):
+        """Test that removed, reordered or edited rules are honoured."""
+        contract = {
+            "tool_name": "test_tool",
+            "rules": [
+                {"trigger_condition": "'a' in tool_output", "instruction": "A"},
+                {"trigger_condition": "'b' in tool_output", "instruction": "B"},
+            ],
+        }
+        assert _evaluate_contract(contract, "b only")["instruction"] == "B"
+
+        contract["rules"].reverse()
+        assert _evaluate_contract(contract, "a and b")["instruction"] == "B"
+
+        contract["rules"][0]["trigger_condition"] = "'c' in tool_output"
+        assert _evaluate_contract(contract, "a and b")["instruction"] == "A"
+
+        del contract["rules"][1]
+        assert _evaluate_contract(contract, "a and b") == {
+            "instruction": None,
+            "rule": None,
+        }
+
 
 class TestControlLayer:
     """Test the control_layer function."""